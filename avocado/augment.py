@@ -6,7 +6,7 @@ from tqdm import tqdm
 
 from .astronomical_object import AstronomicalObject
 from .dataset import Dataset
-from .instruments import band_central_wavelengths
+from .instruments import band_central_wavelength_array, get_band_codes
 from .utils import settings, logger
 
 class Augmentor():
@@ -40,14 +40,24 @@ class Augmentor():
     - :func:`Augmentor._simulate_light_curve_uncertainties`
     - :func:`Augmentor._simulate_detection`
 
+    Subclasses can also implement :func:`Augmentor._augment_metadata_batch` to
+    generate the metadata for many augmented objects at once, and
+    :func:`Augmentor._simulate_observations` to simulate the light curve
+    uncertainties and detection in a single step.
+
     Parameters
     ----------
+    random_state : int or numpy.random.Generator (optional)
+        The random number generator to use for all of the augmentation, or a
+        seed used to initialize one. Setting this makes the augmentation
+        reproducible. By default, a new generator is seeded from the operating
+        system.
     cosmology_kwargs : kwargs (optional)
         Optional parameters to modify the cosmology assumed in the augmentation
         procedure. These kwargs will be passed to
         astropy.cosmology.FlatLambdaCDM.
     """
-    def __init__(self, **cosmology_kwargs):
+    def __init__(self, random_state=None, **cosmology_kwargs):
         # Default cosmology to use. This is the one assumed for the PLAsTiCC
         # dataset.
         cosmology_parameters = {
@@ -60,6 +70,48 @@ class Augmentor():
 
         self.cosmology = FlatLambdaCDM(**cosmology_parameters)
 
+        # Random number generator used for all of the augmentation. Generator
+        # instances are faster than the legacy np.random functions for most
+        # distributions.
+        self._rng = np.random.default_rng(random_state)
+
+        # Cached grid of distance moduli used by _calculate_distmod.
+        self._distmod_grid = None
+
+    def _calculate_distmod(self, redshift):
+        """Calculate the distance modulus for a given redshift.
+
+        astropy evaluates a numerical integral every time that the distance
+        modulus is calculated, which is slow. Instead, we evaluate the distance
+        modulus once on a grid that is uniform in log-redshift and interpolate
+        on that grid. The interpolation error is below 1e-6 mag. Redshifts
+        outside of the grid are passed directly to astropy.
+
+        Parameters
+        ==========
+        redshift : float
+            The redshift to calculate the distance modulus at.
+
+        Returns
+        =======
+        distmod : float
+            The distance modulus in magnitudes.
+        """
+        if self._distmod_grid is None:
+            grid_log_redshifts = np.linspace(np.log(1e-4), np.log(10.), 10000)
+            grid_distmods = self.cosmology.distmod(
+                np.exp(grid_log_redshifts)).value
+            self._distmod_grid = (grid_log_redshifts, grid_distmods)
+
+        grid_log_redshifts, grid_distmods = self._distmod_grid
+
+        log_redshift = np.log(redshift)
+        if (log_redshift < grid_log_redshifts[0] or log_redshift >
+                grid_log_redshifts[-1]):
+            return self.cosmology.distmod(redshift).value
+
+        return np.interp(log_redshift, grid_log_redshifts, grid_distmods)
+
     def _augment_metadata(self, reference_object):
         """Generate new metadata for the augmented object.
 
@@ -78,6 +130,28 @@ class Augmentor():
         """
         return NotImplementedError
 
+    def _augment_metadata_batch(self, reference_objects):
+        """Generate new metadata for many augmented objects at once.
+
+        By default, this calls `_augment_metadata` for each reference object.
+        Survey-specific subclasses can override this method to draw the random
+        numbers for all of the objects at once, which is much faster.
+
+        Parameters
+        ==========
+        reference_objects : list
+            The :class:`AstronomicalObject` instances to use as references for
+            the augmentation. The same object can appear multiple times to
+            generate several augmentations of it.
+
+        Returns
+        =======
+        augmented_metadatas : list
+            The augmented metadata dicts, one for each reference object.
+        """
+        return [self._augment_metadata(reference_object) for reference_object
+                in reference_objects]
+
     def _choose_target_observation_count(self, augmented_metadata):
         """Choose the target number of observations for a new augmented light
         curve.
@@ -179,12 +253,12 @@ class Augmentor():
 
         # Shift the observations forward or backward in time by a small
         # amount.
-        sampling_times['time'] += np.random.uniform(-max_time_shift,
+        sampling_times['time'] += self._rng.uniform(-max_time_shift,
                                                     max_time_shift)
 
         # Drop a block of observations corresponding to the typical width of a
         # season to create light curves with large missing chunks.
-        block_start = np.random.uniform(start_time-block_width, end_time)
+        block_start = self._rng.uniform(start_time-block_width, end_time)
         block_end = block_start + block_width
         block_mask = ((sampling_times['time'] < block_start) |
                       (sampling_times['time'] > block_end))
@@ -203,7 +277,7 @@ class Augmentor():
         # redshifts.
         num_fill = int(target_observation_count * (redshift_scale - 1))
         if num_fill > 0:
-            new_indices = np.random.choice(sampling_times.index, num_fill,
+            new_indices = self._rng.choice(sampling_times.index, num_fill,
                                            replace=True)
             new_rows = sampling_times.loc[new_indices]
 
@@ -213,13 +287,13 @@ class Augmentor():
             # targets like kilonovae. All that we really care about is getting
             # the correct signal-to-noise for each bin.
             # tweak_scale = 2
-            # time_tweaks = np.random.uniform(-tweak_scale, tweak_scale,
+            # time_tweaks = self._rng.uniform(-tweak_scale, tweak_scale,
             # num_fill)
             # new_rows['time'] += time_tweaks * redshift_scale
             # new_rows['ref_time'] += time_tweaks
 
             # Choose new bands randomly.
-            new_rows['band'] = np.random.choice(reference_object.bands,
+            new_rows['band'] = self._rng.choice(reference_object.bands,
                                                 num_fill, replace=True)
 
             sampling_times = pd.concat([sampling_times, new_rows])
@@ -229,7 +303,7 @@ class Augmentor():
         # least 10% of observations to get some shakeup of the light curve.
         num_drop = int(max(len(sampling_times) - target_observation_count,
                            drop_fraction * target_observation_count))
-        drop_indices = np.random.choice(
+        drop_indices = self._rng.choice(
             sampling_times.index, num_drop, replace=False
         )
         sampling_times = sampling_times.drop(drop_indices).copy()
@@ -244,7 +318,7 @@ class Augmentor():
 
         This method needs to be implemented in survey-specific subclasses of
         this class. It should simulate the observation uncertainties for the
-        light curve.
+        light curve. The observations may be updated in place.
 
         Parameters
         ==========
@@ -290,6 +364,40 @@ class Augmentor():
         """
         return NotImplementedError
 
+    def _simulate_observations(self, observations, augmented_metadata):
+        """Simulate the observation-related noise and the detection process
+        for a light curve.
+
+        By default, this calls `_simulate_light_curve_uncertainties` followed
+        by `_simulate_detection`. Survey-specific subclasses can override this
+        method to do both steps at once.
+
+        Parameters
+        ==========
+        observations : pandas.DataFrame
+            The augmented observations that have been sampled from a Gaussian
+            Process. These observations have model flux uncertainties listed
+            that should be included in the final uncertainties.
+        augmented_metadata : dict
+            The augmented metadata
+
+        Returns
+        =======
+        observations : pandas.DataFrame
+            The observations with uncertainties added and the detected flag
+            set.
+        pass_detection : bool
+            Whether or not the full light curve passes the detection thresholds
+            used for the full sample.
+        """
+        observations = self._simulate_light_curve_uncertainties(
+            observations, augmented_metadata)
+
+        observations, pass_detection = self._simulate_detection(
+            observations, augmented_metadata)
+
+        return observations, pass_detection
+
     def _resample_light_curve(self, reference_object, augmented_metadata):
         """Resample a light curve as part of the augmenting procedure
 
@@ -330,8 +438,8 @@ class Augmentor():
             reference_redshift = reference_object.metadata['host_specz']
             redshift_scale = (1 + new_redshift) / (1 + reference_redshift)
 
-            new_wavelengths = np.array([band_central_wavelengths[i] for i in
-                                        observations['band']])
+            band_codes = get_band_codes(observations['band'])
+            new_wavelengths = band_central_wavelength_array[band_codes]
             eval_wavelengths = new_wavelengths / redshift_scale
             pred_x_data = np.vstack([observations['reference_time'],
                                      eval_wavelengths]).T
@@ -350,8 +458,8 @@ class Augmentor():
             if reference_redshift != 0:
                 # Adjust brightness for extragalactic objects. We simply follow
                 # the Hubble diagram.
-                delta_distmod = (self.cosmology.distmod(reference_redshift) -
-                                 self.cosmology.distmod(new_redshift)).value
+                delta_distmod = (self._calculate_distmod(reference_redshift) -
+                                 self._calculate_distmod(new_redshift))
                 adjust_scale *= 10**(0.4*delta_distmod)
 
             observations['flux'] *= adjust_scale
@@ -361,13 +469,9 @@ class Augmentor():
             observations['model_flux'] = observations['flux']
             observations['model_flux_error'] = observations['flux_error']
 
-            # Add in light curve noise. This is survey specific and must be
-            # implemented in subclasses.
-            observations = self._simulate_light_curve_uncertainties(
-                observations, augmented_metadata)
-
-            # Simulate detection
-            observations, pass_detection = self._simulate_detection(
+            # Add in light curve noise and simulate detection. This is survey
+            # specific and must be implemented in subclasses.
+            observations, pass_detection = self._simulate_observations(
                 observations, augmented_metadata)
 
             # If our light curve passes detection thresholds, we're done!
@@ -377,7 +481,8 @@ class Augmentor():
         # Failed to generate valid observations.
         return None
 
-    def augment_object(self, reference_object, force_success=True):
+    def augment_object(self, reference_object, force_success=True,
+                       augmented_metadata=None):
         """Generate an augmented version of an object.
 
         Parameters
@@ -392,6 +497,10 @@ class Augmentor():
             actually augmenting a dataset there is a massive speed up to
             ignoring bad light curves without a major change in classification
             performance.
+        augmented_metadata : dict (optional)
+            Augmented metadata to use for the first attempt, typically
+            generated with `_augment_metadata_batch`. If not specified, new
+            metadata is generated with `_augment_metadata`.
 
         Returns
         =======
@@ -402,13 +511,15 @@ class Augmentor():
         # string to add on to the end of the original object id that is very
         # unlikely to have collisions.
         ref_object_id = reference_object.metadata['object_id']
-        random_str = ''.join(np.random.choice(list(string.ascii_letters), 10))
+        random_str = ''.join(self._rng.choice(list(string.ascii_letters),
+                                              10))
         new_object_id = '%s_aug_%s' % (ref_object_id, random_str)
 
         while True:
             # Augment the metadata. The details of how this should work is
             # survey specific, so this must be implemented in subclasses.
-            augmented_metadata = self._augment_metadata(reference_object)
+            if augmented_metadata is None:
+                augmented_metadata = self._augment_metadata(reference_object)
             augmented_metadata['object_id'] = new_object_id
             augmented_metadata['reference_object_id'] = ref_object_id
 
@@ -428,6 +539,7 @@ class Augmentor():
             else:
                 logger.warn("Failed to generate a light curve for redshift "
                             "%.2f. Retrying." % augmented_metadata['redshift'])
+                augmented_metadata = None
 
     def augment_dataset(self, augment_name, dataset, num_augments,
                         include_reference=True):
@@ -459,9 +571,17 @@ class Augmentor():
             if include_reference:
                 augmented_objects.append(reference_object)
 
-            for i in range(num_augments):
-                augmented_object = self.augment_object(reference_object,
-                                                       force_success=False)
+            # Generate the metadata for all of the augmentations of this
+            # object at once.
+            augmented_metadatas = self._augment_metadata_batch(
+                [reference_object] * num_augments
+            )
+
+            for augmented_metadata in augmented_metadatas:
+                augmented_object = self.augment_object(
+                    reference_object, force_success=False,
+                    augmented_metadata=augmented_metadata
+                )
                 if augmented_object is not None:
                     augmented_objects.append(augmented_object)
 
@@ -4,6 +4,11 @@ This module is used to define properties of various instruments. This should
 eventually be split out into some kind of configuration file setup.
 """
 
+import numpy as np
+import pandas as pd
+
+from .utils import AvocadoException
+
 band_central_wavelengths = {
     'lsstu': 3671.,
     'lsstg': 4827.,
@@ -22,3 +27,44 @@ band_plot_colors = {
     'lsstz': 'C3',
     'lssty': 'goldenrod',
 }
+
+# Order of the bands when they are encoded as integer codes. The code for a
+# band is its position in this tuple.
+band_order = tuple(band_central_wavelengths.keys())
+band_index = pd.Index(band_order)
+
+# Band properties as arrays aligned with band_order. These can be indexed
+# directly with the band codes returned by get_band_codes.
+band_central_wavelength_array = np.array(
+    [band_central_wavelengths[band] for band in band_order]
+)
+band_plot_color_array = np.array(
+    [band_plot_colors[band] for band in band_order]
+)
+
+
+def get_band_codes(bands, index=band_index):
+    """Convert band names into integer band codes.
+
+    Parameters
+    ----------
+    bands : list-like of str
+        The band names to convert.
+    index : pandas.Index (optional)
+        An index of band names that defines the codes. The code of each band is
+        its position in this index. By default, band_index is used, which
+        follows band_order.
+
+    Returns
+    -------
+    band_codes : numpy.array
+        The position in the index of each band.
+    """
+    band_codes = index.get_indexer(bands)
+
+    if np.any(band_codes < 0):
+        raise AvocadoException(
+            "Unknown bands %s!" % np.unique(np.asarray(bands)[band_codes < 0])
+        )
+
+    return band_codes
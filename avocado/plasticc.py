@@ -6,6 +6,7 @@ import pandas as pd
 from scipy.special import erf
 
 from .dataset import Dataset
+from .instruments import get_band_codes
 from .utils import settings, AvocadoException, logger
 
 from .augment import Augmentor
@@ -18,6 +19,153 @@ plasticc_start_time = 59580
 plasticc_end_time = 60675
 plasticc_bands = ['lsstu', 'lsstg', 'lsstr', 'lssti', 'lsstz', 'lssty']
 
+# Index used to convert band names into integer codes with get_band_codes. The
+# code of each band is its position in plasticc_bands, and these codes are used
+# to index the lookup tables below. pandas builds the hash table for the index
+# once and then reuses it for every lookup.
+plasticc_band_index = pd.Index(plasticc_bands)
+
+# Parameters of the lognormal distributions used to model the measurement
+# uncertainties in each band for the WFD and DDF surveys. This table is indexed
+# as [ddf, band_code] where ddf is 0 for the WFD survey and 1 for the DDF
+# survey. Each entry is (mu, sigma) for the corresponding band in
+# plasticc_bands.
+plasticc_noise_table = np.array([
+    [
+        # WFD
+        [2.34, 0.43],   # lsstu
+        [0.94, 0.41],   # lsstg
+        [1.30, 0.41],   # lsstr
+        [1.82, 0.42],   # lssti
+        [2.56, 0.36],   # lsstz
+        [3.33, 0.37],   # lssty
+    ],
+    [
+        # DDF
+        [0.68, 0.26],   # lsstu
+        [0.25, 0.50],   # lsstg
+        [0.16, 0.36],   # lsstr
+        [0.53, 0.27],   # lssti
+        [0.88, 0.22],   # lsstz
+        [1.76, 0.23],   # lssty
+    ],
+], dtype=np.float64)
+
+
+def _set_column_values(observations, column, values):
+    """Update the values of an existing column in a DataFrame.
+
+    Assigning a column with pandas' __setitem__ has a large overhead compared
+    to the cost of our simulations. If the array backing the column can be
+    written to, we copy the new values into it directly. Otherwise, for example
+    when pandas' copy-on-write mode is enabled, we fall back to assigning the
+    column.
+
+    Parameters
+    ----------
+    observations : pandas.DataFrame
+        The DataFrame to update. This is updated in place.
+    column : str
+        The name of the column to update.
+    values : numpy.array
+        The new values for the column.
+    """
+    column_values = observations[column].values
+
+    if (isinstance(column_values, np.ndarray)
+            and column_values.flags.writeable
+            and column_values.dtype == values.dtype):
+        column_values[:] = values
+    else:
+        observations[column] = values
+
+
+def _simulate_plasticc_noise(flux, flux_error, band_codes, ddf, rng):
+    """Simulate the PLAsTiCC measurement noise for an array of observations.
+
+    See `PlasticcAugmentor._simulate_light_curve_uncertainties` for details.
+
+    Parameters
+    ----------
+    flux : numpy.array
+        The model fluxes of the observations.
+    flux_error : numpy.array
+        The model flux uncertainties of the observations.
+    band_codes : numpy.array
+        The band codes of the observations in plasticc_band_index.
+    ddf : bool
+        Whether the observations are in the DDF survey.
+    rng : numpy.random.Generator
+        The random number generator to use.
+
+    Returns
+    -------
+    flux : numpy.array
+        The fluxes with noise added.
+    flux_error : numpy.array
+        The flux uncertainties including the added noise.
+    """
+    lognormal_parameters = plasticc_noise_table[int(bool(ddf)), band_codes]
+
+    # Draw all of the random numbers that we need at once. The first row is
+    # transformed into the lognormal noise levels, and the second row into the
+    # noise that is added to each observation. Everything is done in place in
+    # the buffer of draws.
+    draws = rng.standard_normal((2, len(flux)))
+
+    add_stds = draws[0]
+    add_stds *= lognormal_parameters[:, 1]
+    add_stds += lognormal_parameters[:, 0]
+    np.exp(add_stds, out=add_stds)
+
+    noise_add = draws[1]
+    noise_add *= add_stds
+
+    # Update the fluxes and add the uncertainties in quadrature. The results
+    # are written into the arrays holding the random draws to avoid creating
+    # any temporary arrays.
+    new_flux = np.add(flux, noise_add, out=noise_add)
+    new_flux_error = np.hypot(flux_error, add_stds, out=add_stds)
+
+    return new_flux, new_flux_error
+
+
+def _simulate_plasticc_detection(flux, flux_error, rng):
+    """Simulate the PLAsTiCC detection process for an array of observations.
+
+    See `PlasticcAugmentor._simulate_detection` for details.
+
+    Parameters
+    ----------
+    flux : numpy.array
+        The fluxes of the observations.
+    flux_error : numpy.array
+        The flux uncertainties of the observations.
+    rng : numpy.random.Generator
+        The random number generator to use.
+
+    Returns
+    -------
+    detected : numpy.array
+        Boolean array indicating whether each observation was detected.
+    """
+    # The detection probability is (1 + erf((s2n - 5.5) / 2)) / 2. Rather than
+    # evaluating it explicitly, we compare uniform draws over [-1, 1) to the
+    # error function directly, which is equivalent. Everything is evaluated in
+    # place to avoid temporary arrays.
+    erf_values = np.abs(flux)
+    erf_values /= flux_error
+    erf_values -= 5.5
+    erf_values /= 2.
+    erf(erf_values, out=erf_values)
+
+    draws = rng.uniform(-1., 1., len(flux))
+
+    detected = draws < erf_values
+
+    return detected
+
+
 plasticc_kaggle_weights = {6: 1, 15: 2, 16: 1, 42: 1, 52: 1, 53: 1, 62: 1, 64:
                            2, 65: 1, 67: 1, 88: 1, 90: 1, 92: 1, 95: 1, 99: 2}
 plasticc_flat_weights = {6: 1, 15: 1, 16: 1, 42: 1, 52: 1, 53: 1, 62: 1, 64: 1,
@@ -25,11 +173,23 @@ plasticc_flat_weights = {6: 1, 15: 1, 16: 1, 42: 1, 52: 1, 53: 1, 62: 1, 64: 1,
 
 
 class PlasticcAugmentor(Augmentor):
-    """Implementation of an Augmentor for the PLAsTiCC dataset"""
-    def __init__(self):
-        super().__init__()
+    """Implementation of an Augmentor for the PLAsTiCC dataset
+
+    Parameters
+    ----------
+    random_state : int or numpy.random.Generator (optional)
+        The random number generator to use, or a seed used to initialize one.
+        See :class:`Augmentor` for details.
+    """
+    def __init__(self, random_state=None):
+        super().__init__(random_state=random_state)
 
         self._photoz_reference = None
+        self._photoz_count = None
+
+        # Buffer of pre-drawn photo-z candidates used by _simulate_photoz.
+        self._photoz_buffer = None
+        self._photoz_buffer_index = 0
 
         # Load the photo-z model
         self._load_photoz_reference()
@@ -43,9 +203,10 @@ class PlasticcAugmentor(Augmentor):
 
         Returns
         =======
-        photoz_reference numpy ndarray
-            A Nx3 array with reference photo-zs for each entry with a spec-z in
-            the test set. The columns are spec-z, photo-z and photo-z error.
+        photoz_reference : tuple of numpy ndarrays
+            Reference photo-zs for each entry with a spec-z in the test set.
+            This is a tuple of three contiguous arrays with the spec-z, photo-z
+            and photo-z error respectively.
         """
         if self._photoz_reference is None:
             logger.info("Loading photoz reference...")
@@ -59,23 +220,75 @@ class PlasticcAugmentor(Augmentor):
             # columns that we care about.
             chunksize = 10**5
 
-            use_metadata = []
+            # The filtering is done on raw numpy arrays to avoid building
+            # intermediate pandas objects for every chunk.
+            specz_chunks = []
+            photoz_chunks = []
+            photoz_err_chunks = []
             for chunk in pd.read_hdf(data_path, 'metadata', mode='r',
                                      chunksize=chunksize):
-                cut = chunk['host_specz'] > 0
-                use_metadata.append(chunk[cut][['host_specz', 'host_photoz',
-                                                'host_photoz_error']])
-
-            use_metadata = pd.concat(use_metadata)
-
-            result = np.vstack([use_metadata['host_specz'],
-                                use_metadata['host_photoz'],
-                                use_metadata['host_photoz_error']]).T
+                specz = chunk['host_specz'].to_numpy(dtype=np.float64)
+                photoz = chunk['host_photoz'].to_numpy(dtype=np.float64)
+                photoz_err = chunk['host_photoz_error'].to_numpy(
+                    dtype=np.float64)
+
+                cut = specz > 0
+                specz_chunks.append(specz[cut])
+                photoz_chunks.append(photoz[cut])
+                photoz_err_chunks.append(photoz_err[cut])
+
+            result = (
+                np.concatenate(specz_chunks),
+                np.concatenate(photoz_chunks),
+                np.concatenate(photoz_err_chunks),
+            )
 
             self._photoz_reference = result
+            self._photoz_count = len(result[0])
 
         return self._photoz_reference
 
+    def _draw_photoz_batch(self, size=1024):
+        """Draw a batch of candidate photo-z differences and errors from the
+        photo-z reference.
+
+        Drawing the random numbers for many candidates at once is much faster
+        than drawing them one at a time. See `_simulate_photoz` for details on
+        how the candidates are used.
+
+        Parameters
+        ----------
+        size : int (optional)
+            The number of candidates to draw.
+
+        Returns
+        -------
+        photoz_diffs : numpy.array
+            The differences between the photo-z and spec-z to apply to the new
+            redshifts.
+        photoz_errs : numpy.array
+            The photo-z errors to use for each candidate.
+        """
+        specz, photoz, photoz_err = self._load_photoz_reference()
+
+        idx = self._rng.integers(0, self._photoz_count, size)
+        ref_specz = specz[idx]
+        ref_photoz = photoz[idx]
+        ref_photoz_err = photoz_err[idx]
+
+        # Randomly choose the order for the difference. Degeneracies work both
+        # ways, so even if we only see specz=0.2 -> photoz=3.0 in the data, the
+        # reverse also happens, but we can't get spec-zs at z=3 so we don't see
+        # this.
+        signs = 1 - 2 * self._rng.integers(0, 2, size=size, dtype=np.int8)
+        photoz_diffs = (ref_photoz - ref_specz) * signs
+
+        # Add some noise to the error so that the classifier can't focus in on
+        # it.
+        photoz_errs = ref_photoz_err * self._rng.normal(1, 0.05, size)
+
+        return photoz_diffs, photoz_errs
+
     def _simulate_photoz(self, redshift):
         """Simulate the photoz determination for a lightcurve using the test
         set as a reference.
@@ -85,6 +298,10 @@ class PlasticcAugmentor(Augmentor):
         photo-zs, but it does ensure that we cover all of the available
         parameter space with at least some simulations.
 
+        Candidates are drawn in batches with `_draw_photoz_batch` and consumed
+        one at a time. Candidates that would lead to a negative photo-z are
+        skipped.
+
         Parameters
         ----------
         redshift : float
@@ -98,99 +315,64 @@ class PlasticcAugmentor(Augmentor):
         host_photoz_error : float
             The simulated photoz error of the host.
         """
-        photoz_reference = self._load_photoz_reference()
-
         while True:
-            ref_idx = np.random.choice(len(photoz_reference))
-            ref_specz, ref_photoz, ref_photoz_err = photoz_reference[ref_idx]
-
-            # Randomly choose the order for the difference. Degeneracies work
-            # both ways, so even if we only see specz=0.2 -> photoz=3.0 in the
-            # data, the reverse also happens, but we can't get spec-zs at z=3
-            # so we don't see this.
-            new_diff = (ref_photoz - ref_specz) * np.random.choice([-1, 1])
+            if (self._photoz_buffer is None or self._photoz_buffer_index >=
+                    len(self._photoz_buffer[0])):
+                # The buffer is stored as lists of python floats. The
+                # rejection loop below only does scalar operations, and those
+                # are much faster on python floats than on numpy scalars.
+                diffs, errs = self._draw_photoz_batch()
+                self._photoz_buffer = (diffs.tolist(), errs.tolist())
+                self._photoz_buffer_index = 0
+
+            diffs, errs = self._photoz_buffer
+            idx = self._photoz_buffer_index
+            self._photoz_buffer_index += 1
 
             # Apply the difference, and make sure that the photoz is > 0.
-            new_photoz = redshift + new_diff
+            new_photoz = redshift + diffs[idx]
             if new_photoz < 0:
                 continue
 
-            # Add some noise to the error so that the classifier can't focus in
-            # on it.
-            new_photoz_err = ref_photoz_err * np.random.normal(1, 0.05)
+            new_photoz_err = errs[idx]
 
             break
 
         return new_photoz, new_photoz_err
 
-    def _augment_redshift(self, reference_object, augmented_metadata):
-        """Choose a new redshift and simulate the photometric redshift for an
-        augmented object
+    def _draw_log_uniform(self, low, high, size=None):
+        """Draw from a log-uniform distribution.
+
+        We use low * (high / low)**u where u is uniform over [0, 1). This is
+        equivalent to exp(uniform(log(low), log(high))), but it only needs a
+        single power operation instead of two logs and an exp, and a plain
+        uniform draw is the cheapest draw available from the generator.
 
         Parameters
-        ==========
-        reference_object : :class:`AstronomicalObject`
-            The object to use as a reference for the augmentation.
+        ----------
+        low : float or numpy.array
+            The lower bound(s) of the distribution.
+        high : float or numpy.array
+            The upper bound(s) of the distribution.
+        size : int (optional)
+            The number of values to draw. This must match the length of low
+            and high if they are arrays. By default, a single value is drawn.
 
-        augmented_metadata : dict
-            The augmented metadata to add the new redshift too. This will be
-            updated in place.
+        Returns
+        -------
+        values : float or numpy.array
+            The values drawn from the distribution.
         """
-        # Choose a new redshift.
-        if reference_object.metadata['galactic']:
-            # Galactic object, redshift stays the same
-            augmented_metadata['redshift'] = 0
-            augmented_metadata['host_specz'] = 0
-            augmented_metadata['host_photoz'] = 0
-            augmented_metadata['host_photoz_error'] = 0
-
-            # Choose a factor (in magnitudes) to change the brightness by
-            augmented_metadata['augment_brightness'] = (
-                np.random.normal(0.5, 0.5)
-            )
-        else:
-            # Choose a new redshift based on the reference template redshift.
-            template_redshift = reference_object.metadata['redshift']
-
-            # First, we limit the redshift range as a multiple of the original
-            # redshift. We avoid making templates too much brighter because
-            # the lower redshift templates will be left with noise that is
-            # unrealistic. We also avoid going to too high of a relative
-            # redshift because the templates there will be too faint to be
-            # detected and the augmentor will waste a lot of time without being
-            # able to actually generate a template.
-            min_redshift = 0.95 * template_redshift
-            max_redshift = 5 * template_redshift
-
-            # Second, for high-redshift objects, we add a constraint to make
-            # sure that we aren't evaluating the template at wavelengths where
-            # the GP extrapolation is unreliable.
-            max_redshift = np.min(
-                [max_redshift, 1.5 * (1 + template_redshift) - 1]
-            )
-
-            # Choose new redshift from a log-uniform distribution over the
-            # allowable redshift range.
-            aug_redshift = np.exp(np.random.uniform(
-                np.log(min_redshift), np.log(max_redshift)
-            ))
-
-            # Simulate a new photometric redshift
-            aug_photoz, aug_photoz_error = self._simulate_photoz(aug_redshift)
-            aug_distmod = self.cosmology.distmod(aug_photoz).value
-
-            augmented_metadata['redshift'] = aug_redshift
-            augmented_metadata['host_specz'] = aug_redshift
-            augmented_metadata['host_photoz'] = aug_photoz
-            augmented_metadata['host_photoz_error'] = aug_photoz_error
-            augmented_metadata['augment_brightness'] = 0.
+        return low * (high / low)**self._rng.random(size)
 
     def _augment_metadata(self, reference_object):
         """Generate new metadata for the augmented object.
 
         This method needs to be implemented in survey-specific subclasses of
         this class. The new redshift, photoz, coordinates, etc. should be
-        chosen in this method.
+        chosen in this method. For PLAsTiCC, this is a wrapper around
+        `_augment_metadata_batch` so that there is a single implementation of
+        the augmentation procedure.
 
         Parameters
         ==========
@@ -202,28 +384,109 @@ class PlasticcAugmentor(Augmentor):
         augmented_metadata : dict
             The augmented metadata
         """
-        augmented_metadata = reference_object.metadata.copy()
+        return self._augment_metadata_batch([reference_object])[0]
 
-        # Choose a new redshift.
-        self._augment_redshift(reference_object, augmented_metadata)
+    def _augment_metadata_batch(self, reference_objects):
+        """Generate new metadata for many augmented objects at once.
 
-        # Choose whether the new object will be in the DDF or not.
-        if reference_object.metadata['ddf']:
-            # Most observations are WFD observations, so generate more of
-            # those. The DDF and WFD samples are effectively completely
-            # different, so this ratio doesn't really matter.
-            augmented_metadata['ddf'] = np.random.rand() > 0.8
-        else:
-            # If the reference wasn't a DDF observation, can't simulate a DDF
-            # observation.
-            augmented_metadata['ddf'] = False
+        All of the random numbers are drawn for every object at once. The new
+        redshift, photoz, brightness, DDF flag and mwebv are chosen here.
+
+        Parameters
+        ==========
+        reference_objects : list
+            The :class:`AstronomicalObject` instances to use as references for
+            the augmentation. The same object can appear multiple times to
+            generate several augmentations of it.
+
+        Returns
+        =======
+        augmented_metadatas : list
+            The augmented metadata dicts, one for each reference object.
+        """
+        augmented_metadatas = [i.metadata.copy() for i in reference_objects]
+        num_objects = len(augmented_metadatas)
+
+        galactic = np.array([i['galactic'] for i in augmented_metadatas],
+                            dtype=bool)
+        extragalactic = ~galactic
+        num_extragalactic = np.count_nonzero(extragalactic)
+
+        # Galactic objects stay at a redshift of 0, but we change their
+        # brightness by a factor (in magnitudes) instead.
+        augment_brightness = np.zeros(num_objects)
+        augment_brightness[galactic] = self._rng.normal(
+            0.5, 0.5, num_objects - num_extragalactic
+        )
 
-        # Smear the mwebv value a bit so that it doesn't uniquely identify
+        # Choose new redshifts for extragalactic objects based on the reference
+        # template redshifts.
+        template_redshifts = np.array(
+            [i['redshift'] for i in augmented_metadatas], dtype=np.float64
+        )[extragalactic]
+
+        # First, we limit the redshift range as a multiple of the original
+        # redshift. We avoid making templates too much brighter because the
+        # lower redshift templates will be left with noise that is unrealistic.
+        # We also avoid going to too high of a relative redshift because the
+        # templates there will be too faint to be detected and the augmentor
+        # will waste a lot of time without being able to actually generate a
+        # template.
+        min_redshifts = 0.95 * template_redshifts
+        max_redshifts = 5 * template_redshifts
+
+        # Second, for high-redshift objects, we add a constraint to make sure
+        # that we aren't evaluating the template at wavelengths where the GP
+        # extrapolation is unreliable.
+        max_redshifts = np.minimum(max_redshifts,
+                                   1.5 * (1 + template_redshifts) - 1)
+
+        # Choose new redshifts from a log-uniform distribution over the
+        # allowable redshift range.
+        aug_redshifts = self._draw_log_uniform(min_redshifts, max_redshifts,
+                                               num_extragalactic)
+
+        redshifts = np.zeros(num_objects)
+        redshifts[extragalactic] = aug_redshifts
+
+        # Choose whether the new objects will be in the DDF or not. If the
+        # reference wasn't a DDF observation, we can't simulate a DDF
+        # observation. Most observations are WFD observations, so generate
+        # more of those. The DDF and WFD samples are effectively completely
+        # different, so this ratio doesn't really matter.
+        reference_ddf = np.array([i['ddf'] for i in augmented_metadatas],
+                                 dtype=bool)
+        ddf = reference_ddf & (self._rng.random(num_objects) > 0.8)
+
+        # Smear the mwebv values a bit so that they don't uniquely identify
         # points. I leave the position on the sky unchanged (ra, dec, etc.).
         # Don't put any of those variables directly into the classifier!
-        augmented_metadata['mwebv'] *= np.random.normal(1, 0.1)
+        mwebv_scales = self._rng.normal(1, 0.1, num_objects)
+
+        # Fill in the metadata. Converting the arrays to lists first gives
+        # python scalars which are much faster to work with in this loop.
+        for (augmented_metadata, is_galactic, redshift, brightness, is_ddf,
+             mwebv_scale) in zip(augmented_metadatas, galactic.tolist(),
+                                 redshifts.tolist(),
+                                 augment_brightness.tolist(), ddf.tolist(),
+                                 mwebv_scales.tolist()):
+            if is_galactic:
+                photoz = 0.
+                photoz_error = 0.
+            else:
+                # Simulate a new photometric redshift. The candidates are
+                # already drawn in batches by _simulate_photoz.
+                photoz, photoz_error = self._simulate_photoz(redshift)
 
-        return augmented_metadata
+            augmented_metadata['redshift'] = redshift
+            augmented_metadata['host_specz'] = redshift
+            augmented_metadata['host_photoz'] = photoz
+            augmented_metadata['host_photoz_error'] = photoz_error
+            augmented_metadata['augment_brightness'] = brightness
+            augmented_metadata['ddf'] = is_ddf
+            augmented_metadata['mwebv'] *= mwebv_scale
+
+        return augmented_metadatas
 
     def _choose_target_observation_count(self, augmented_metadata):
         """Choose the target number of observations for a new augmented light
@@ -244,22 +507,24 @@ class PlasticcAugmentor(Augmentor):
             The target number of observations in the new light curve.
         """
         if augmented_metadata['ddf']:
-            target_observation_count = int(np.random.normal(330, 30))
+            target_observation_count = int(self._rng.normal(330, 30))
         else:
             # I estimate the distribution of number of observations in the
-            # WFD regions with a mixture of 3 gaussian distributions.
-            gauss_choice = np.random.choice(3, p=[0.05, 0.4, 0.55])
-            if gauss_choice == 0:
+            # WFD regions with a mixture of 3 gaussian distributions. The
+            # component is chosen with a single uniform draw which is much
+            # cheaper than np.random.choice with probabilities.
+            gauss_choice = self._rng.random()
+            if gauss_choice < 0.05:
                 mu = 95
                 sigma = 20
-            elif gauss_choice == 1:
+            elif gauss_choice < 0.45:
                 mu = 115
                 sigma = 8
-            elif gauss_choice == 2:
+            else:
                 mu = 138
                 sigma = 8
             target_observation_count = int(
-                np.clip(np.random.normal(mu, sigma), 50, None))
+                max(self._rng.normal(mu, sigma), 50))
 
         return target_observation_count
 
@@ -273,12 +538,17 @@ class PlasticcAugmentor(Augmentor):
         surveys. Those measurement uncertainties are added to the simulated
         observations.
 
+        The observations are updated in place. They are generated from scratch
+        for each augmented light curve in `_resample_light_curve`, so there is
+        no need to make a copy of them here.
+
         Parameters
         ----------
         observations : pandas.DataFrame
             The augmented observations that have been sampled from a Gaussian
             Process. These observations have model flux uncertainties listed
-            that should be included in the final uncertainties.
+            that should be included in the final uncertainties. This will be
+            updated in place.
         augmented_metadata : dict
             The augmented metadata
 
@@ -287,46 +557,78 @@ class PlasticcAugmentor(Augmentor):
         observations : pandas.DataFrame
             The observations with uncertainties added.
         """
-        # Make a copy so that we don't modify the original array.
-        observations = observations.copy()
+        self._update_uncertainties(observations, augmented_metadata)
+
+        return observations
+
+    def _update_uncertainties(self, observations, augmented_metadata):
+        """Add the simulated PLAsTiCC noise to a light curve in place.
+
+        This is shared by `_simulate_light_curve_uncertainties` and
+        `_simulate_observations`.
+
+        Parameters
+        ==========
+        observations : pandas.DataFrame
+            The augmented observations. This is updated in place.
+        augmented_metadata : dict
+            The augmented metadata
+
+        Returns
+        =======
+        flux : numpy.array
+            The updated fluxes.
+        flux_error : numpy.array
+            The updated flux uncertainties.
+        """
+        flux = observations['flux'].to_numpy()
+        flux_error = observations['flux_error'].to_numpy()
 
         if len(observations) == 0:
             # No data, skip
-            return observations
+            return flux, flux_error
 
-        if augmented_metadata['ddf']:
-            band_noises = {
-                'lsstu': (0.68, 0.26),
-                'lsstg': (0.25, 0.50),
-                'lsstr': (0.16, 0.36),
-                'lssti': (0.53, 0.27),
-                'lsstz': (0.88, 0.22),
-                'lssty': (1.76, 0.23),
-            }
-        else:
-            band_noises = {
-                'lsstu': (2.34, 0.43),
-                'lsstg': (0.94, 0.41),
-                'lsstr': (1.30, 0.41),
-                'lssti': (1.82, 0.42),
-                'lsstz': (2.56, 0.36),
-                'lssty': (3.33, 0.37),
-            }
-
-        # Calculate the new noise levels using a lognormal distribution for
-        # each band.
-        lognormal_parameters = np.array([band_noises[i] for i in
-                                         observations['band']])
-        add_stds = np.random.lognormal(lognormal_parameters[:, 0],
-                                       lognormal_parameters[:, 1])
-
-        noise_add = np.random.normal(loc=0.0, scale=add_stds)
-        observations['flux'] += noise_add
-        observations['flux_error'] = np.sqrt(
-            observations['flux_error']**2 + add_stds**2
+        band_codes = get_band_codes(observations['band'],
+                                    plasticc_band_index)
+        flux, flux_error = _simulate_plasticc_noise(
+            flux, flux_error, band_codes, augmented_metadata['ddf'], self._rng
         )
 
-        return observations
+        _set_column_values(observations, 'flux', flux)
+        _set_column_values(observations, 'flux_error', flux_error)
+
+        return flux, flux_error
+
+    def _update_detections(self, observations, flux, flux_error):
+        """Set the simulated PLAsTiCC detected flags for a light curve in
+        place.
+
+        This is shared by `_simulate_detection` and `_simulate_observations`.
+
+        Parameters
+        ==========
+        observations : pandas.DataFrame
+            The augmented observations. This is updated in place.
+        flux : numpy.array
+            The fluxes of the observations.
+        flux_error : numpy.array
+            The flux uncertainties of the observations.
+
+        Returns
+        =======
+        pass_detection : bool
+            Whether or not the full light curve passes the detection thresholds
+            used for the full sample.
+        """
+        detected = _simulate_plasticc_detection(flux, flux_error, self._rng)
+
+        # The detected column is new, so it has to be assigned with pandas.
+        observations['detected'] = detected
+
+        # The light curve passes if at least 2 observations were detected.
+        pass_detection = np.count_nonzero(detected) >= 2
+
+        return pass_detection
 
     def _simulate_detection(self, observations, augmented_metadata):
         """Simulate the detection process for a light curve.
@@ -352,11 +654,45 @@ class PlasticcAugmentor(Augmentor):
             Whether or not the full light curve passes the detection thresholds
             used for the full sample.
         """
-        s2n = np.abs(observations['flux']) / observations['flux_error']
-        prob_detected = (erf((s2n - 5.5) / 2) + 1) / 2.
-        observations['detected'] = np.random.rand(len(s2n)) < prob_detected
+        pass_detection = self._update_detections(
+            observations,
+            observations['flux'].to_numpy(),
+            observations['flux_error'].to_numpy(),
+        )
+
+        return observations, pass_detection
 
-        pass_detection = np.sum(observations['detected']) >= 2
+    def _simulate_observations(self, observations, augmented_metadata):
+        """Simulate the observation-related noise and the detection process
+        for a light curve.
+
+        This is equivalent to calling `_simulate_light_curve_uncertainties`
+        followed by `_simulate_detection`, but it works directly on the arrays
+        of fluxes and uncertainties. Each column is read from the DataFrame and
+        written back to it only once. The observations are updated in place.
+
+        Parameters
+        ==========
+        observations : pandas.DataFrame
+            The augmented observations that have been sampled from a Gaussian
+            Process. These observations have model flux uncertainties listed
+            that should be included in the final uncertainties.
+        augmented_metadata : dict
+            The augmented metadata
+
+        Returns
+        =======
+        observations : pandas.DataFrame
+            The observations with uncertainties added and the detected flag
+            set.
+        pass_detection : bool
+            Whether or not the full light curve passes the detection thresholds
+            used for the full sample.
+        """
+        flux, flux_error = self._update_uncertainties(observations,
+                                                      augmented_metadata)
+        pass_detection = self._update_detections(observations, flux,
+                                                 flux_error)
 
         return observations, pass_detection
 